@@ -5,6 +5,7 @@ Krystal Integration Tests - pytest Configuration
 """
 
 import os
+import re
 import sys
 import time
 import socket
@@ -45,6 +46,21 @@ logging.basicConfig(
 
 print(f"📄 Integration test logs will be saved to: {log_file}")
 
+# secrets.env 中的 KEY=VALUE 行（注释行不匹配），一次扫描完成解析
+ENV_LINE_RE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)=(.*?)\s*$", re.M)
+
+# secrets.env 中总是覆盖 .env 默认值的变量
+LOCAL_OVERRIDE_KEYS = frozenset(
+    {
+        "SFTP_HOST",
+        "SFTP_PORT",
+        "SFTP_USERNAME",
+        "SFTP_PASSWORD",
+        "SFTP_REMOTE_BASE_PATH",
+        "API_TOKEN",
+    }
+)
+
 
 def check_port_open(host: str, port: int, timeout: int = 2) -> bool:
     """检查指定端口是否开放"""
@@ -195,26 +211,15 @@ def setup_test_environment():
                 "sk-your-openai-api-key-here" in content or "sk-your-openai" in content
             )
 
-            for line in content.split("\n"):
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        # 对于 API key：只加载有效的（非占位符）
-                        if "OPENAI_API_KEY" in key:
-                            current_key = os.getenv("OPENAI_API_KEY", "")
-                            if not has_placeholder_key and len(value) > 20:
-                                os.environ[key] = value
-                        # 对于其他变量：总是覆盖 .env 的默认值
-                        elif key in [
-                            "SFTP_HOST",
-                            "SFTP_PORT",
-                            "SFTP_USERNAME",
-                            "SFTP_PASSWORD",
-                            "SFTP_REMOTE_BASE_PATH",
-                            "API_TOKEN",
-                        ]:
-                            os.environ[key] = value
+            for match in ENV_LINE_RE.finditer(content):
+                key, value = match.groups()
+                # 对于 API key：只加载有效的（非占位符）
+                if "OPENAI_API_KEY" in key:
+                    if not has_placeholder_key and len(value) > 20:
+                        os.environ[key] = value
+                # 对于其他变量：总是覆盖 .env 的默认值
+                elif key in LOCAL_OVERRIDE_KEYS:
+                    os.environ[key] = value
         print(f"Loaded local config from {env_file}")
 
     # 打印关键环境变量（隐藏敏感信息）
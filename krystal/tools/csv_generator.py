@@ -7,7 +7,7 @@ import random
 import string
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import csv
 import re
@@ -18,6 +18,27 @@ from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+ALPHANUMERIC = string.ascii_letters + string.digits
+BOOLEAN_VALUES = (True, False)
+DEFAULT_EMAIL_DOMAINS = ("example.com", "test.com")
+
+# Field types drawn a whole column at a time by _generate_column
+BULK_FIELD_TYPES = frozenset({"enum", "boolean", "int"})
+
+# Widest int range drawn in bulk with random.choices; wider ranges use randint
+# so len(range) cannot overflow and every value stays reachable
+BULK_INT_SPAN_LIMIT = 2**32
+
+# Character classes understood by _generate_from_pattern, applied in order
+PATTERN_CHAR_CLASSES = (
+    (re.compile(r"\[a-z\]"), string.ascii_lowercase),
+    (re.compile(r"\[A-Z\]"), string.ascii_uppercase),
+    (re.compile(r"\[0-9\]"), string.digits),
+    (re.compile(r"\[a-zA-Z\]"), string.ascii_letters),
+    (re.compile(r"\[a-zA-Z0-9\]"), ALPHANUMERIC),
+)
+PATTERN_QUANTIFIER_RE = re.compile(r"\(([a-zA-Z0-9]+)\)(\{[^}]+\})")
+
 
 class GenerateCSVInput(BaseModel):
     """Input for CSV generation"""
@@ -106,20 +127,71 @@ class CSVGeneratorTool(BaseTool):
         """Generate CSV from schema definition"""
         fields = schema.get("fields", [])
         headers = [f["name"] for f in fields]
+        columns = [self._generate_column(field, row_count) for field in fields]
+        rows = zip(*columns) if columns else [()] * row_count
 
         with open(output_file, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(headers)
-
-            for _ in range(row_count):
-                row = []
-                for field in fields:
-                    value = self._generate_field_value(field)
-                    row.append(value)
-                writer.writerow(row)
+            writer.writerows(rows)
 
         return str(output_file.absolute())
 
+    def _generate_column(self, field: Dict[str, Any], row_count: int) -> List[Any]:
+        """Generate all values for one field, drawing simple types in bulk"""
+        field_type = field.get("type", "string")
+
+        if field_type == "enum":
+            values = field.get("values", [])
+            if values:
+                return random.choices(values, k=row_count)
+            return [None] * row_count
+
+        elif field_type == "boolean":
+            return random.choices(BOOLEAN_VALUES, k=row_count)
+
+        elif field_type == "int":
+            min_val, max_val = self._int_bounds(field)
+            if max_val - min_val < BULK_INT_SPAN_LIMIT:
+                return random.choices(range(min_val, max_val + 1), k=row_count)
+            return [random.randint(min_val, max_val) for _ in range(row_count)]
+
+        generate = self._compile_field_generator(field)
+        return [generate() for _ in range(row_count)]
+
+    def _int_bounds(self, field: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Read and validate the min/max bounds of an int field
+
+        Args:
+            field: Field definition from the data schema
+
+        Returns:
+            Inclusive (min, max) bounds as ints
+
+        Raises:
+            ValueError: If a bound is a non-integer float or min exceeds max
+        """
+        name = field.get("name")
+        bounds = []
+        for key, default in (("min", 0), ("max", 100)):
+            value = field.get(key, default)
+            # LLM-built schemas may send whole-number floats such as 1.0
+            if isinstance(value, float):
+                if not value.is_integer():
+                    raise ValueError(
+                        f"Int field '{name}' has non-integer {key}: {value}"
+                    )
+                value = int(value)
+            bounds.append(value)
+
+        min_val, max_val = bounds
+        if min_val > max_val:
+            raise ValueError(
+                f"Int field '{name}' has min {min_val} greater than max {max_val}"
+            )
+        return min_val, max_val
+
     def _generate_from_template(
         self,
         template_path: str,
@@ -133,14 +205,16 @@ class CSVGeneratorTool(BaseTool):
 
         template = Template(template_content)
 
-        # Generate sample data for template
+        # Generate sample data for template, one column per field
         sample_data = []
         fields = schema.get("fields", [])
+        names = [field["name"] for field in fields]
+        columns = [self._generate_column(field, row_count) for field in fields]
+        rows = zip(*columns) if columns else [()] * row_count
 
-        for i in range(row_count):
+        for i, values in enumerate(rows):
             row_data = {"index": i, "timestamp": datetime.now().isoformat()}
-            for field in fields:
-                row_data[field["name"]] = self._generate_field_value(field)
+            row_data.update(zip(names, values))
             sample_data.append(row_data)
 
         # Render template
@@ -151,83 +225,74 @@ class CSVGeneratorTool(BaseTool):
 
         return str(output_file.absolute())
 
-    def _generate_field_value(self, field: Dict[str, Any]) -> Any:
-        """Generate a value based on field type"""
+    def _compile_field_generator(self, field: Dict[str, Any]) -> Callable[[], Any]:
+        """
+        Resolve a field's settings once and return a value generator
+
+        Args:
+            field: Field definition from the data schema
+
+        Returns:
+            Zero-argument callable producing one value per call
+
+        Raises:
+            ValueError: For types in BULK_FIELD_TYPES, which _generate_column owns
+        """
         field_type = field.get("type", "string")
 
-        if field_type == "uuid":
-            return str(uuid.uuid4())
+        if field_type in BULK_FIELD_TYPES:
+            raise ValueError(
+                f"'{field_type}' fields are generated in bulk by _generate_column"
+            )
+
+        elif field_type == "uuid":
+            return lambda: str(uuid.uuid4())
 
         elif field_type == "string":
+            if "pattern" in field:
+                pattern = field["pattern"]
+                return lambda: self._generate_from_pattern(pattern)
             min_len = field.get("min_length", 5)
             max_len = field.get("max_length", 20)
-            length = random.randint(min_len, max_len)
-            if "pattern" in field:
-                return self._generate_from_pattern(field["pattern"])
-            return "".join(
-                random.choices(string.ascii_letters + string.digits, k=length)
+            return lambda: "".join(
+                random.choices(ALPHANUMERIC, k=random.randint(min_len, max_len))
             )
 
-        elif field_type == "int":
-            min_val = field.get("min", 0)
-            max_val = field.get("max", 100)
-            return random.randint(min_val, max_val)
-
         elif field_type == "float":
             min_val = field.get("min", 0.0)
             max_val = field.get("max", 100.0)
             decimals = field.get("decimals", 2)
-            return round(random.uniform(min_val, max_val), decimals)
+            return lambda: round(random.uniform(min_val, max_val), decimals)
 
         elif field_type == "datetime":
             days_offset = field.get("days_offset", 30)
-            start_date = datetime.now() - timedelta(days=days_offset)
-            end_date = datetime.now()
-            random_date = start_date + timedelta(
-                seconds=random.randint(0, int((end_date - start_date).total_seconds()))
-            )
             format_str = field.get("format", "%Y-%m-%d %H:%M:%S")
-            return random_date.strftime(format_str)
-
-        elif field_type == "enum":
-            values = field.get("values", [])
-            if values:
-                return random.choice(values)
-            return None
-
-        elif field_type == "boolean":
-            return random.choice([True, False])
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=days_offset)
+            window_seconds = int((end_date - start_date).total_seconds())
+            return lambda: (
+                start_date + timedelta(seconds=random.randint(0, window_seconds))
+            ).strftime(format_str)
 
         elif field_type == "email":
-            domains = field.get("domains", ["example.com", "test.com"])
-            username = "".join(random.choices(string.ascii_lowercase, k=8))
-            return f"{username}@{random.choice(domains)}"
+            domains = field.get("domains", DEFAULT_EMAIL_DOMAINS)
+            return lambda: (
+                f"{''.join(random.choices(string.ascii_lowercase, k=8))}"
+                f"@{random.choice(domains)}"
+            )
 
         elif field_type == "phone":
-            return f"1{random.randint(1000000000, 9999999999)}"
+            return lambda: f"1{random.randint(1000000000, 9999999999)}"
 
         else:
-            return ""
+            return lambda: ""
 
     def _generate_from_pattern(self, pattern: str) -> str:
         """Generate string matching regex pattern (simplified)"""
         # Simple pattern replacement for common patterns
         result = pattern
-        result = re.sub(
-            r"\[a-z\]", lambda m: random.choice(string.ascii_lowercase), result
-        )
-        result = re.sub(
-            r"\[A-Z\]", lambda m: random.choice(string.ascii_uppercase), result
-        )
-        result = re.sub(r"\[0-9\]", lambda m: random.choice(string.digits), result)
-        result = re.sub(
-            r"\[a-zA-Z\]", lambda m: random.choice(string.ascii_letters), result
-        )
-        result = re.sub(
-            r"\[a-zA-Z0-9\]",
-            lambda m: random.choice(string.ascii_letters + string.digits),
-            result,
-        )
+        for class_re, alphabet in PATTERN_CHAR_CLASSES:
+            result = class_re.sub(lambda m: random.choice(alphabet), result)
 
         # Handle quantifiers like {3}, {2,5}
         def replace_quantifier(match):
@@ -238,12 +303,9 @@ class CSVGeneratorTool(BaseTool):
                 count = random.randint(min_count, max_count)
             else:
                 count = int(quantifier.strip("{}"))
-            return "".join(
-                random.choice(string.ascii_letters + string.digits)
-                for _ in range(count)
-            )
+            return "".join(random.choice(ALPHANUMERIC) for _ in range(count))
 
-        result = re.sub(r"\(([a-zA-Z0-9]+)\)(\{[^}]+\})", replace_quantifier, result)
+        result = PATTERN_QUANTIFIER_RE.sub(replace_quantifier, result)
 
         return result
 
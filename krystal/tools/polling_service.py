@@ -82,6 +82,10 @@ class PollingServiceTool(BaseTool):
         success_statuses = success_statuses or ["completed", "success"]
         failure_statuses = failure_statuses or ["failed", "error"]
 
+        # Normalize terminal statuses once for case-insensitive lookups
+        success_set = frozenset(s.lower() for s in success_statuses)
+        failure_set = frozenset(s.lower() for s in failure_statuses)
+
         headers = headers or {}
 
         attempt = 0
@@ -130,7 +134,7 @@ class PollingServiceTool(BaseTool):
             logger.info(f"   尝试 {attempt}/{max_attempts}: 当前状态 = {status}")
 
             # Check if completed
-            if status in [s.lower() for s in success_statuses]:
+            if status in success_set:
                 return {
                     "success": True,
                     "task_id": task_id,
@@ -143,7 +147,7 @@ class PollingServiceTool(BaseTool):
                 }
 
             # Check if failed
-            if status in [s.lower() for s in failure_statuses]:
+            if status in failure_set:
                 return {
                     "success": False,
                     "task_id": task_id,
@@ -112,6 +112,7 @@ class DataValidatorTool(BaseTool):
         errors = []
         warnings = []
         matched_rows = 0
+        rules_by_field = self._index_rules(rules)
 
         # Build lookup dict if key_column specified
         if key_column:
@@ -145,7 +146,7 @@ class DataValidatorTool(BaseTool):
                             errors.append(f"Row {key}: Missing column '{col}'")
                         elif exp_row[col] != act_row[col]:
                             # Apply custom rules if specified
-                            rule = self._find_rule(rules, col)
+                            rule = rules_by_field.get(col)
                             if rule:
                                 error = self._apply_rule(rule, exp_row, act_row, key)
                                 if error:
@@ -190,14 +191,12 @@ class DataValidatorTool(BaseTool):
             "matched_rows": matched_rows,
         }
 
-    def _find_rule(
-        self, rules: List[Dict[str, Any]], column: str
-    ) -> Optional[Dict[str, Any]]:
-        """Find validation rule for a column"""
+    def _index_rules(self, rules: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Index validation rules by field, keeping the first rule per field"""
+        rules_by_field: Dict[str, Dict[str, Any]] = {}
         for rule in rules:
-            if rule.get("field") == column:
-                return rule
-        return None
+            rules_by_field.setdefault(rule.get("field"), rule)
+        return rules_by_field
 
     def _apply_rule(
         self, rule: Dict[str, Any], expected_row: Dict, actual_row: Dict, key: str
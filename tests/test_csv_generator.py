@@ -252,6 +252,92 @@ class TestCSVGeneratorTool:
             assert len(rows) == 1
             assert rows[0] == ["id", "name"]
 
+    def test_generate_csv_empty_schema(self, tool, temp_dir):
+        """测试 5.1：边界情况 - 没有字段的 schema
+
+        验证：
+        - 仍然生成 row_count 行（空行）
+        """
+        output_path = os.path.join(temp_dir, "test_empty_schema.csv")
+
+        result = tool._run(
+            data_schema={"fields": []}, row_count=3, output_path=output_path
+        )
+
+        assert result["success"] is True
+        with open(result["file_path"], "r", newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+
+            # 空 header + 3 行空数据
+            assert rows == [[]] * 4
+
+    def test_generate_csv_int_whole_number_float_bounds(self, tool, temp_dir):
+        """测试 5.2：int 字段的整数值 float 边界（如 1.0）
+
+        验证：
+        - 与 randint 一样接受 1.0 / 5.0 这类边界
+        - 生成值在范围内
+        """
+        output_path = os.path.join(temp_dir, "test_int_float_bounds.csv")
+        schema = {"fields": [{"name": "n", "type": "int", "min": 1.0, "max": 5.0}]}
+
+        result = tool._run(data_schema=schema, row_count=20, output_path=output_path)
+
+        assert result["success"] is True
+        with open(result["file_path"], "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                assert 1 <= int(row["n"]) <= 5
+
+    @pytest.mark.parametrize(
+        "bounds, message",
+        [
+            ({"min": 0.5, "max": 1.5}, "non-integer min"),
+            ({"min": 10, "max": 1}, "greater than max"),
+        ],
+    )
+    def test_generate_csv_int_invalid_bounds(self, tool, temp_dir, bounds, message):
+        """测试 5.3：int 字段的非法边界
+
+        验证：
+        - 非整数 float 边界和 min > max 都返回明确的错误
+        """
+        output_path = os.path.join(temp_dir, "test_int_invalid_bounds.csv")
+        schema = {"fields": [{"name": "n", "type": "int", **bounds}]}
+
+        result = tool._run(data_schema=schema, row_count=3, output_path=output_path)
+
+        assert result["success"] is False
+        assert message in result["error"]
+
+    def test_generate_csv_int_large_range(self, tool, temp_dir):
+        """测试 5.4：int 字段的超大范围
+
+        验证：
+        - 范围超过 C ssize_t 时仍能生成
+        - 生成值在范围内
+        """
+        output_path = os.path.join(temp_dir, "test_int_large_range.csv")
+        schema = {"fields": [{"name": "n", "type": "int", "min": 0, "max": 10**19}]}
+
+        result = tool._run(data_schema=schema, row_count=5, output_path=output_path)
+
+        assert result["success"] is True
+        with open(result["file_path"], "r", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+            assert len(rows) == 5
+            for row in rows:
+                assert 0 <= int(row["n"]) <= 10**19
+
+    @pytest.mark.parametrize("field_type", ["enum", "boolean", "int"])
+    def test_compile_field_generator_rejects_bulk_types(self, tool, field_type):
+        """测试 5.5：按列批量生成的类型不能走逐值生成器
+
+        验证：
+        - enum / boolean / int 抛出 ValueError，而不是静默返回空字符串
+        """
+        with pytest.raises(ValueError, match="generated in bulk"):
+            tool._compile_field_generator({"name": "f", "type": field_type})
+
     def test_generate_csv_large_dataset(self, tool, temp_dir):
         """测试 6：性能测试 - 大量数据
 